@@ -0,0 +1,41 @@
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from gpu_settings.gpu_utils import (
+    get_current_gpu, is_nvidia_loaded, parse_nvidia_smi,
+    parse_nvidia_processes, get_available_gpus, get_power_state_times
+)
+
+
+class StatsCollector(QObject):
+    """Runs the gpu_utils queries off the GUI thread.
+
+    Meant to be moved to a QThread; each collect_* slot emits its result
+    so the window can fill in the matching panel when it arrives.
+    """
+    # {"gpus": [...], "mode": str, "gpu_name": str}
+    current_ready = pyqtSignal(dict)
+    # parse_nvidia_smi() snapshot (None if the driver isn't loaded), power state times
+    stats_ready = pyqtSignal(object, dict)
+    processes_ready = pyqtSignal(list)
+
+    @pyqtSlot()
+    def collect_current(self):
+        gpus = get_available_gpus()
+        current_mode = get_current_gpu()
+        if current_mode == "nvidia" and is_nvidia_loaded():
+            stats = parse_nvidia_smi()
+            if stats.get("Status") == "suspended":
+                gpu_name = "NVIDIA GPU (suspended)"
+            else:
+                gpu_name = stats.get("Name", "NVIDIA GPU")
+        elif current_mode == "nvidia":
+            gpu_name = "NVIDIA GPU"
+        else:
+            gpu_name = gpus[-1]
+        self.current_ready.emit({"gpus": gpus, "mode": current_mode, "gpu_name": gpu_name})
+
+    @pyqtSlot()
+    def collect_stats(self):
+        stats = parse_nvidia_smi() if is_nvidia_loaded() else None
+        self.stats_ready.emit(stats, get_power_state_times())
+        self.processes_ready.emit(parse_nvidia_processes())
@@ -0,0 +1,156 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+
+DEFAULT_TIMEOUT = 5.0
+# How long to wait for the pipes to drain after killing an overrunning command
+KILL_GRACE_TIMEOUT = 1.0
+
+
+class _Flight:
+    """A command invocation that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CommandRunner:
+    """Run external commands with timeouts, single-flight and a result cache.
+
+    Identical invocations that overlap share one child process, and a result
+    is reused for ``ttl`` seconds after it completes. Commands that overrun
+    their timeout have their whole process group killed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._in_flight = {}
+        self.counters = {"spawns": 0, "cache_hits": 0, "timeouts": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _key(self, cmd, shell, merge_stderr):
+        cmd_key = cmd if isinstance(cmd, str) else tuple(cmd)
+        return (cmd_key, shell, merge_stderr)
+
+    def _spawn(self, cmd, timeout, shell, merge_stderr):
+        self._count("spawns")
+        proc = subprocess.Popen(
+            cmd,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+            start_new_session=True
+        )
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as timeout_error:
+            self._count("timeouts")
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            try:
+                proc.communicate(timeout=KILL_GRACE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                # A descendant that left the group, or a process stuck in
+                # the kernel (D state ignores SIGKILL), still holds the pipes
+                for pipe in (proc.stdout, proc.stderr):
+                    if pipe is not None:
+                        pipe.close()
+            raise timeout_error
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+    def run(self, cmd, timeout=DEFAULT_TIMEOUT, ttl=0, shell=False,
+            merge_stderr=False, text=False):
+        """Run ``cmd`` and return a ``subprocess.CompletedProcess``.
+
+        Raises ``subprocess.TimeoutExpired`` if the command overruns
+        ``timeout`` (``None`` waits forever). Failed spawns and timeouts are
+        never cached.
+        """
+        key = self._key(cmd, shell, merge_stderr)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.counters["cache_hits"] += 1
+                return self._decode(cached[1], text)
+
+            flight = self._in_flight.get(key)
+            owner = flight is None
+            if owner:
+                flight = _Flight()
+                self._in_flight[key] = flight
+            else:
+                # Joining a running invocation counts as a cache hit
+                self.counters["cache_hits"] += 1
+
+        if owner:
+            try:
+                flight.result = self._spawn(cmd, timeout, shell, merge_stderr)
+            except Exception as e:
+                flight.error = e
+            finally:
+                # Always release waiters, even on KeyboardInterrupt
+                with self._lock:
+                    del self._in_flight[key]
+                    if flight.result is not None and ttl > 0:
+                        self._cache[key] = (time.monotonic() + ttl, flight.result)
+                if flight.result is None and flight.error is None:
+                    flight.error = RuntimeError(f"{cmd!r} was interrupted")
+                flight.done.set()
+        elif not flight.done.wait(timeout):
+            self._count("timeouts")
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        if flight.error is not None:
+            raise flight.error
+        return self._decode(flight.result, text)
+
+    def check_output(self, cmd, timeout=DEFAULT_TIMEOUT, ttl=0, shell=False,
+                     merge_stderr=False, text=False):
+        """Like ``subprocess.check_output``, but through the runner."""
+        result = self.run(cmd, timeout=timeout, ttl=ttl, shell=shell,
+                          merge_stderr=merge_stderr, text=text)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, cmd, result.stdout, result.stderr
+            )
+        return result.stdout
+
+    def invalidate(self, cmd=None):
+        """Drop cached results for ``cmd``, or for every command."""
+        with self._lock:
+            if cmd is None:
+                self._cache.clear()
+                return
+            cmd_key = cmd if isinstance(cmd, str) else tuple(cmd)
+            for key in [k for k in self._cache if k[0] == cmd_key]:
+                del self._cache[key]
+
+    def get_counters(self):
+        with self._lock:
+            return dict(self.counters)
+
+    @staticmethod
+    def _decode(result, text):
+        if not text:
+            return result
+        return subprocess.CompletedProcess(
+            result.args,
+            result.returncode,
+            result.stdout.decode() if result.stdout is not None else None,
+            result.stderr.decode() if result.stderr is not None else None
+        )
+
+
+# Shared instance used by gpu_utils and the dependency checker
+runner = CommandRunner()
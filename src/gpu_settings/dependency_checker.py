@@ -8,6 +8,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QObject
 
+from gpu_settings.command_runner import runner
+from gpu_settings.gpu_utils import LSPCI_TTL
+
 
 class InstallerWorker(QObject):
     finished = pyqtSignal()
@@ -24,11 +27,8 @@ class InstallerWorker(QObject):
             spec = importlib.util.find_spec(package)
             return spec is not None
         else:
-            result = subprocess.run(
-                ["dpkg", "-s", package],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            # A dpkg timeout propagates to run(), which reports it via error
+            result = runner.run(["dpkg", "-s", package])
             return result.returncode == 0
 
     def run(self):
@@ -97,29 +97,28 @@ class DependencyChecker(QWidget):
         self.move(x, y)
 
     def is_installed(self, package, is_python=False):
+        """Return True/False, or None if dpkg timed out and the state is unknown."""
         if is_python:
             spec = importlib.util.find_spec(package)
             return spec is not None
         else:
-            result = subprocess.run(
-                ["dpkg", "-s", package],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
+            try:
+                result = runner.run(["dpkg", "-s", package])
+            except subprocess.TimeoutExpired:
+                return None
             return result.returncode == 0
 
     def has_nvidia_gpu(self):
         """Check if the system has a dedicated NVIDIA GPU."""
         try:
-            result = subprocess.run(
-                ["lspci"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-            )
+            result = runner.run(["lspci"], ttl=LSPCI_TTL, text=True)
             return "NVIDIA" in result.stdout
         except Exception:
             return False
 
     def check_dependencies(self):
         self.missing = []
+        self.unchecked = []  # packages whose dpkg query timed out
 
         # Python requirements (always needed)
         python_reqs = [
@@ -141,7 +140,10 @@ class DependencyChecker(QWidget):
         # Check Python and system packages
         for module_name, pkg in requirements:
             if module_name in ("nvidia_prime", "nvidia_utils_535"):
-                if not self.is_installed(pkg):  # System package
+                installed = self.is_installed(pkg)  # System package
+                if installed is None:
+                    self.unchecked.append(pkg)
+                elif not installed:
                     self.missing.append(pkg)
             else:
                 if not self.is_installed(module_name.split('.')[0], is_python=True):
@@ -149,9 +151,20 @@ class DependencyChecker(QWidget):
 
         # NVIDIA driver check (only if GPU exists)
         if self.has_nvidia_gpu() and not self.is_nvidia_working():
-            if not self.has_nvidia_driver_installed():
+            driver_installed = self.has_nvidia_driver_installed()
+            if driver_installed is None:
+                self.unchecked.append("nvidia-driver-535")
+            elif not driver_installed:
                 self.missing.append("nvidia-driver-535")
 
+        if self.unchecked:
+            # Don't run a root install on the strength of a hung query
+            QMessageBox.warning(
+                self, "Warning",
+                "Could not check these packages (dpkg timed out), skipping:\n"
+                + ", ".join(self.unchecked)
+            )
+
         if self.missing:
             self.label.setText(
                 "⚠️ Missing dependencies:\n" + ", ".join(self.missing) + "\nInstalling..."
@@ -178,15 +191,15 @@ class DependencyChecker(QWidget):
             self.dependencies_ready.emit()
 
     def has_nvidia_driver_installed(self):
-        """Check if any NVIDIA driver (nvidia-driver-*) is installed."""
+        """Check if any NVIDIA driver (nvidia-driver-*) is installed.
+
+        Returns None if dpkg timed out and the state is unknown.
+        """
         try:
-            result = subprocess.run(
-                ["dpkg", "--list"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            result = runner.run(["dpkg", "--list"], text=True)
             return any("nvidia-driver-" in line for line in result.stdout.splitlines())
+        except subprocess.TimeoutExpired:
+            return None
         except Exception:
             return False
 
@@ -201,11 +214,9 @@ class DependencyChecker(QWidget):
 
     def is_nvidia_working(self):
         try:
-            result = subprocess.run(
-                ["nvidia-smi"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            result = runner.run(["nvidia-smi"])
             return result.returncode == 0
-        except FileNotFoundError:
+        except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
     def show_reboot_prompt(self):
@@ -1,10 +1,47 @@
 import subprocess
 import csv
+import os
+import time
 from io import StringIO
 
+from gpu_settings.command_runner import runner
+
+SYSFS_PCI_DEVICES = "/sys/bus/pci/devices"
+NVIDIA_VENDOR_ID = "0x10de"
+
+# Result TTLs (seconds) for the query commands; the refresh tick is 1s
+LSPCI_TTL = 60
+PRIME_QUERY_TTL = 0.5
+LSMOD_TTL = 0.5
+
+NVIDIA_SMI_TIMEOUT = 3
+
+# Every nvidia-smi run opens the device and restarts its runtime PM idle
+# timer (power/autosuspend_delay_ms, 5s by default with NVIDIA's dynamic
+# power management). A busy dGPU is sampled every NVIDIA_SMI_INTERVAL
+# seconds; after each idle reading (0% utilization, no processes) the
+# interval doubles up to NVIDIA_SMI_IDLE_MAX_INTERVAL, so an idle dGPU
+# sees gaps longer than the autosuspend delay and can drop to D3cold.
+# Callers get the last snapshot between samples.
+NVIDIA_SMI_INTERVAL = 1
+NVIDIA_SMI_IDLE_MAX_INTERVAL = 32
+
+# Runtime PM states in which querying the driver would wake the dGPU
+SLEEPING_STATES = ("suspended", "suspending")
+
+# Seconds spent in each runtime PM state, as observed by get_dgpu_power_state()
+power_state_times = {}
+_last_power_sample = None
+_pci_device_cache = {}
+
+# Last (stats, processes) read from nvidia-smi, and when to read again
+_nvidia_sample = None
+_nvidia_sample_interval = NVIDIA_SMI_INTERVAL
+_next_nvidia_sample = 0.0
+
 def get_integrated_gpu():
     try:
-        output = subprocess.check_output(["lspci"], text=True).splitlines()
+        output = runner.check_output(["lspci"], ttl=LSPCI_TTL, text=True).splitlines()
         for line in output:
             line_lower = line.lower()
 
@@ -38,28 +75,140 @@ def get_integrated_gpu():
 
 def get_current_gpu():
     try:
-        output = subprocess.check_output(["prime-select", "query"], stderr=subprocess.STDOUT).decode().strip()
+        output = runner.check_output(
+            ["prime-select", "query"], ttl=PRIME_QUERY_TTL, merge_stderr=True
+        ).decode().strip()
         return output
     except Exception as e:
         return f"Error: {str(e)}"
 
+def _read_sysfs(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def set_sysfs_root(path):
+    """Point the runtime PM lookups at another sysfs PCI devices directory."""
+    global SYSFS_PCI_DEVICES
+    SYSFS_PCI_DEVICES = path
+    _pci_device_cache.clear()
+
+def find_nvidia_pci_device(sysfs_root=None):
+    """Return the sysfs directory of the NVIDIA display device, or None."""
+    if sysfs_root is None:
+        sysfs_root = SYSFS_PCI_DEVICES
+    if sysfs_root in _pci_device_cache:
+        return _pci_device_cache[sysfs_root]
+    _pci_device_cache[sysfs_root] = _scan_nvidia_pci_device(sysfs_root)
+    return _pci_device_cache[sysfs_root]
+
+def _scan_nvidia_pci_device(sysfs_root):
+    try:
+        devices = sorted(os.listdir(sysfs_root))
+    except OSError:
+        return None
+    for dev in devices:
+        dev_path = os.path.join(sysfs_root, dev)
+        vendor = _read_sysfs(os.path.join(dev_path, "vendor"))
+        pci_class = _read_sysfs(os.path.join(dev_path, "class"))
+        # PCI class 0x03xxxx is "display controller"
+        if vendor == NVIDIA_VENDOR_ID and pci_class and pci_class.startswith("0x03"):
+            return dev_path
+    return None
+
+def _record_power_state(state):
+    global _last_power_sample
+    now = time.monotonic()
+    if _last_power_sample is not None:
+        prev_state, prev_time = _last_power_sample
+        power_state_times[prev_state] = power_state_times.get(prev_state, 0.0) + (now - prev_time)
+    _last_power_sample = (state, now)
+
+def get_dgpu_power_state(sysfs_root=None):
+    """Return the runtime PM status of the dGPU ("active", "suspended", ...).
+
+    Reads sysfs only, so it never wakes a suspended device. "suspending" is
+    reported as "suspended". Returns None when there is no NVIDIA device or
+    runtime PM is not exposed.
+    """
+    dev_path = find_nvidia_pci_device(sysfs_root)
+    if dev_path is None:
+        return None
+    state = _read_sysfs(os.path.join(dev_path, "power", "runtime_status"))
+    if state is None:
+        return None
+    if state in SLEEPING_STATES:
+        state = "suspended"
+    _record_power_state(state)
+    return state
+
+def is_dgpu_suspended(sysfs_root=None):
+    return get_dgpu_power_state(sysfs_root) == "suspended"
+
+def get_power_state_times():
+    """Return a copy of the seconds spent in each observed power state."""
+    times = dict(power_state_times)
+    if _last_power_sample is not None:
+        state, since = _last_power_sample
+        times[state] = times.get(state, 0.0) + (time.monotonic() - since)
+    return times
+
 def switch_gpu(mode: str):
     subprocess.check_call(["pkexec", "prime-select", mode])
+    runner.invalidate(["prime-select", "query"])
 
 def is_nvidia_loaded():
     try:
-        output = subprocess.check_output(["lsmod | grep nvidia"], shell=True).decode().strip()
+        output = runner.check_output(
+            "lsmod | grep nvidia", shell=True, ttl=LSMOD_TTL
+        ).decode().strip()
         return bool(output)
     except:
         return False
 
+def reset_nvidia_sampling():
+    """Drop the cached nvidia-smi snapshot so the next call queries again."""
+    global _nvidia_sample, _nvidia_sample_interval, _next_nvidia_sample
+    _nvidia_sample = None
+    _nvidia_sample_interval = NVIDIA_SMI_INTERVAL
+    _next_nvidia_sample = 0.0
+
+def _sample_nvidia():
+    global _nvidia_sample, _nvidia_sample_interval, _next_nvidia_sample
+    now = time.monotonic()
+    if _nvidia_sample is None or now >= _next_nvidia_sample:
+        stats = _query_nvidia_stats()
+        processes = _query_nvidia_processes()
+        idle = stats.get("GPU Utilization (%)") == "0" and not processes
+        if idle:
+            _nvidia_sample_interval = min(_nvidia_sample_interval * 2, NVIDIA_SMI_IDLE_MAX_INTERVAL)
+        else:
+            _nvidia_sample_interval = NVIDIA_SMI_INTERVAL
+        _nvidia_sample = (stats, processes)
+        _next_nvidia_sample = now + _nvidia_sample_interval
+    return _nvidia_sample
+
 def parse_nvidia_smi():
     """Return dict with GPU stats instead of raw text."""
+    if is_dgpu_suspended():
+        reset_nvidia_sampling()
+        return {"Status": "suspended"}
+    return dict(_sample_nvidia()[0])
+
+def parse_nvidia_processes():
+    if is_dgpu_suspended():
+        reset_nvidia_sampling()
+        return []
+    return list(_sample_nvidia()[1])
+
+def _query_nvidia_stats():
     try:
-        output = subprocess.check_output(
+        output = runner.check_output(
             ["nvidia-smi", "--query-gpu=name,memory.total,memory.used,utilization.gpu,temperature.gpu,driver_version",
              "--format=csv,noheader,nounits"],
-            stderr=subprocess.STDOUT
+            timeout=NVIDIA_SMI_TIMEOUT, merge_stderr=True
         ).decode().strip()
 
         name, mem_total, mem_used, util, temp, driver = output.split(", ")
@@ -74,15 +223,15 @@ def parse_nvidia_smi():
     except Exception as e:
         return {"Error": str(e)}
 
-def parse_nvidia_processes():
+def _query_nvidia_processes():
     try:
-        output = subprocess.check_output(
+        output = runner.check_output(
             [
                 "nvidia-smi",
                 "--query-compute-apps=pid,process_name,used_gpu_memory",
                 "--format=csv,noheader,nounits"
             ],
-            stderr=subprocess.STDOUT
+            timeout=NVIDIA_SMI_TIMEOUT, merge_stderr=True
         ).decode().strip()
 
         processes = []
@@ -107,7 +256,7 @@ def parse_nvidia_processes():
     
 def has_nvidia_gpu():
     try:
-        output = subprocess.check_output(["lspci"], text=True)
+        output = runner.check_output(["lspci"], ttl=LSPCI_TTL, text=True)
         return "NVIDIA" in output
     except Exception:
         return False
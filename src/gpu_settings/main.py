@@ -1,15 +1,23 @@
+import time
+
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from PyQt6.QtWidgets import QApplication
-from window import MainWindow
 from dependency_checker import DependencyChecker
 
 
 
 def main():
+    # --startup-timing prints time to first paint / first data to stderr
+    startup_timing = "--startup-timing" in sys.argv
+    if startup_timing:
+        sys.argv.remove("--startup-timing")
+
     app = QApplication(sys.argv)
 
 
@@ -18,10 +26,13 @@ def main():
 
 
     def on_ready():
-        checker.close() 
-        win = MainWindow()
+        # Imported here so QtCharts isn't loaded before the checker is shown
+        from window import MainWindow
+
+        checker.close()
+        win = MainWindow(startup_time=STARTUP_TIME if startup_timing else None)
         win.show()
-        app.main_window = win  
+        app.main_window = win
 
     checker.dependencies_ready.connect(on_ready)
 
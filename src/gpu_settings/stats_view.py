@@ -0,0 +1,88 @@
+import gpu_settings.styles as styles
+
+STAT_FIELDS = ["Name", "Driver", "Memory Total (MB)", "Memory Used (MB)",
+               "GPU Utilization (%)", "Temperature (°C)"]
+
+# (warn, crit) thresholds for the colored fields
+UTILIZATION_THRESHOLDS = (70, 90)
+MEMORY_RATIO_THRESHOLDS = (0.7, 0.9)
+TEMPERATURE_THRESHOLDS = (70, 85)
+
+
+def threshold_bucket(value, warn, crit):
+    return "ok" if value < warn else "warn" if value < crit else "crit"
+
+
+def _utilization_bucket(stats):
+    return threshold_bucket(int(stats["GPU Utilization (%)"]), *UTILIZATION_THRESHOLDS)
+
+
+def _memory_bucket(stats):
+    used = int(stats["Memory Used (MB)"])
+    total = int(stats.get("Memory Total (MB)", 1))
+    return threshold_bucket(used / total, *MEMORY_RATIO_THRESHOLDS)
+
+
+def _temperature_bucket(stats):
+    return threshold_bucket(int(stats["Temperature (°C)"]), *TEMPERATURE_THRESHOLDS)
+
+
+# Fields whose color depends on their value; the rest keep the default style
+SEVERITY_RULES = {
+    "GPU Utilization (%)": _utilization_bucket,
+    "Memory Used (MB)": _memory_bucket,
+    "Temperature (°C)": _temperature_bucket,
+}
+
+
+class StatsViewModel:
+    """Turns collector snapshots into the minimal set of label changes.
+
+    Remembers the text and severity bucket last rendered for each field and
+    only reports a field as dirty when one of them changes. Styles come
+    from the precomputed ``styles.STAT_VALUE_STYLES``.
+    """
+
+    def __init__(self, fields=STAT_FIELDS):
+        self.fields = list(fields)
+        # Matches the "-" placeholder labels are created with
+        self.rendered = {field: ("-", "default") for field in self.fields}
+
+    def render(self, stats):
+        """Return {field: (text, bucket)} for a parse_nvidia_smi() snapshot."""
+        rendered = {}
+        for field in self.fields:
+            text = stats.get(field, "-")
+            rule = SEVERITY_RULES.get(field)
+            if rule is None:
+                bucket = "default"
+            else:
+                try:
+                    bucket = rule(stats)
+                except (KeyError, ValueError, ZeroDivisionError):
+                    bucket = "unknown"
+            rendered[field] = (text, bucket)
+        return rendered
+
+    def render_placeholder(self, text):
+        """Return the same muted text for every field (e.g. "N/A")."""
+        return {field: (text, "muted") for field in self.fields}
+
+    def render_stale(self):
+        """Return the last rendered text for every field, muted."""
+        return {field: (text, "muted") for field, (text, _) in self.rendered.items()}
+
+    def diff(self, rendered):
+        """Record ``rendered`` and return {field: (text, style)} for dirty fields.
+
+        ``text`` or ``style`` is None when only the other one changed.
+        """
+        dirty = {}
+        for field, (text, bucket) in rendered.items():
+            old_text, old_bucket = self.rendered.get(field, (None, None))
+            new_text = text if text != old_text else None
+            new_style = styles.STAT_VALUE_STYLES[bucket] if bucket != old_bucket else None
+            if new_text is not None or new_style is not None:
+                dirty[field] = (new_text, new_style)
+            self.rendered[field] = (text, bucket)
+        return dirty
@@ -33,3 +33,20 @@ GROUPBOX_STYLE = """
         padding: 0 5px 0 5px;
     }
 """
+
+SEVERITY_COLORS = {
+    "ok": "#50fa7b",
+    "warn": "#f1fa8c",
+    "crit": "#ff5555",
+}
+
+# Stats value label style per severity bucket, built once so a label's
+# stylesheet is only replaced when its bucket changes
+STAT_VALUE_STYLES = {
+    "default": "font-size: 14px; padding: 3px 0 3px 8px;",
+    "unknown": "color: #50fa7b; font-size: 14px; padding: 3px 0 3px 8px;",
+    "muted": "color: #6272a4; font-size: 14px; padding: 3px 0 3px 8px;",
+    "ok": "color: #50fa7b; font-weight: bold; font-size: 14px; padding: 3px 0 3px 8px;",
+    "warn": "color: #f1fa8c; font-weight: bold; font-size: 14px; padding: 3px 0 3px 8px;",
+    "crit": "color: #ff5555; font-weight: bold; font-size: 14px; padding: 3px 0 3px 8px;",
+}
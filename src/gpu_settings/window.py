@@ -1,24 +1,39 @@
 import subprocess
+import sys
+import time
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QGroupBox, QRadioButton, QMessageBox, QGridLayout,
     QTableWidget, QTableWidgetItem, QScrollArea
 )
-from PyQt6.QtCore import QTimer, QPointF, Qt
-from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+from PyQt6.QtCore import QTimer, QPointF, Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QPen, QColor
+from PyQt6 import sip
 
-from gpu_settings.gpu_utils import (
-    get_current_gpu, switch_gpu, is_nvidia_loaded,
-    parse_nvidia_smi, parse_nvidia_processes, get_available_gpus
+from gpu_settings.gpu_utils import get_current_gpu, switch_gpu, reset_nvidia_sampling
+from gpu_settings.collector import StatsCollector
+from gpu_settings.command_runner import DEFAULT_TIMEOUT, KILL_GRACE_TIMEOUT
+from gpu_settings.stats_view import (
+    StatsViewModel, STAT_FIELDS, UTILIZATION_THRESHOLDS, threshold_bucket
 )
 import gpu_settings.styles as styles
 
 
 class MainWindow(QMainWindow):
     MAX_SEGMENTS = 60 
-    def __init__(self):
+    # Mute the stats once a collection has been running this many seconds
+    STALE_AFTER = 3
+    # Longest a single runner command can take, plus a margin
+    SHUTDOWN_WAIT_MS = int((DEFAULT_TIMEOUT + KILL_GRACE_TIMEOUT + 1) * 1000)
+    request_current = pyqtSignal()
+    request_stats = pyqtSignal()
+
+    def __init__(self, startup_time=None):
         super().__init__()
+        # perf_counter() at process start; set to report startup timings
+        self.startup_time = startup_time
+        self.first_paint_done = False
+        self.first_data_done = False
         self.setWindowTitle("GPU Settings")
         self.showMaximized()
         self.setStyleSheet(styles.MAIN_WINDOW_STYLE)
@@ -28,11 +43,15 @@ class MainWindow(QMainWindow):
 
         # --- Current GPU ---
         h1 = QHBoxLayout()
-        self.current_label = QLabel()
+        self.current_label = QLabel('<span style="color:#50fa7b;">Current GPU:</span> Detecting...')
         self.current_label.setTextFormat(Qt.TextFormat.RichText)
         self.current_label.setStyleSheet("font-size: 18px; font-weight: bold;")
         h1.addWidget(self.current_label)
         h1.addStretch()
+        self.power_label = QLabel()
+        self.power_label.setStyleSheet("color: #6272a4; font-size: 13px;")
+        self.power_label.setVisible(False)
+        h1.addWidget(self.power_label)
         main_layout.addLayout(h1)
 
         # --- Switch GPU ---
@@ -62,45 +81,28 @@ class MainWindow(QMainWindow):
         self.stats_grid.setHorizontalSpacing(15)
         self.stats_grid.setVerticalSpacing(8)
         self.stats_labels = {}
-        fields = ["Name", "Driver", "Memory Total (MB)", "Memory Used (MB)",
-                  "GPU Utilization (%)", "Temperature (°C)"]
-        for i, field in enumerate(fields):
+        self.stats_view = StatsViewModel(STAT_FIELDS)
+        self.pending_stats = {}
+        for i, field in enumerate(STAT_FIELDS):
             lbl = QLabel(f"{field}:")
             lbl.setStyleSheet("font-weight: bold; color: #f8f8f2; font-size: 14px;padding: 3px 0 3px 8px;")
             val = QLabel("-")
-            val.setStyleSheet("font-size: 14px; padding: 3px 0 3px 8px;")
+            val.setStyleSheet(styles.STAT_VALUE_STYLES["default"])
             self.stats_labels[field] = val
             self.stats_grid.addWidget(lbl, i, 0)
             self.stats_grid.addWidget(val, i, 1)
 
         stats_layout.addLayout(self.stats_grid)
 
-        # --- GPU Utilization chart ---
+        # --- GPU Utilization chart (built after first paint, see init_chart) ---
+        self.chart = None
         self.chart_series_segments = []  # store individual color segments
-        self.series = QLineSeries()  # main series for X continuity
-        self.chart = QChart()
-        self.chart.addSeries(self.series)
-        self.chart.setTitle("GPU Utilization (%) Over Time")
-        self.chart.legend().hide()
-
-        self.axisX = QValueAxis()
-        self.axisX.setRange(0, 60)
-        self.axisX.setLabelFormat("%d")
-        self.axisX.setTitleText("Time (s)")
-
-        self.axisY = QValueAxis()
-        self.axisY.setRange(0, 100)
-        self.axisY.setTitleText("Utilization (%)")
-
-        self.chart.addAxis(self.axisX, Qt.AlignmentFlag.AlignBottom)
-        self.chart.addAxis(self.axisY, Qt.AlignmentFlag.AlignLeft)
-        self.series.attachAxis(self.axisX)
-        self.series.attachAxis(self.axisY)
-
-        chart_view = QChartView(self.chart)
-        chart_view.setMinimumHeight(250)
-        chart_view.setStyleSheet("border: 1px solid #6272a4; border-radius: 5px;")
-        stats_layout.addWidget(chart_view)
+        self.stats_layout = stats_layout
+        self.chart_placeholder = QLabel("Loading chart...")
+        self.chart_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.chart_placeholder.setMinimumHeight(250)
+        self.chart_placeholder.setStyleSheet("color: #6272a4; border: 1px solid #6272a4; border-radius: 5px;")
+        stats_layout.addWidget(self.chart_placeholder)
 
         stats_group.setLayout(stats_layout)
         main_layout.addWidget(stats_group)
@@ -144,20 +146,88 @@ class MainWindow(QMainWindow):
         scroll.setWidget(central_widget)
         self.setCentralWidget(scroll)
 
+        # --- Background data collection ---
+        # The shell paints with placeholders; each panel fills in when the
+        # collector thread delivers its data
+        self.collector_thread = QThread()
+        self.collector = StatsCollector()
+        self.collector.moveToThread(self.collector_thread)
+        self.request_current.connect(self.collector.collect_current)
+        self.request_stats.connect(self.collector.collect_stats)
+        self.collector.current_ready.connect(self.update_current)
+        self.collector.stats_ready.connect(self.update_stats)
+        self.collector.processes_ready.connect(self.update_processes)
+        self.collector_thread.start()
+        self.stats_in_flight = False
+        self.stats_requested_at = 0.0
+
         # --- Timer for auto refresh ---
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update_stats)
+        self.timer.timeout.connect(self.refresh_stats)
         self.timer.start(1000)
         self.time_counter = 0
 
-        # Initial update
-        self.update_current()
-        self.update_stats()
-        self.update_processes()
+        self.request_current.emit()
+        self.refresh_stats()
+
+    # --- Startup ---
+    def report_startup(self, stage):
+        if self.startup_time is None:
+            return
+        elapsed_ms = (time.perf_counter() - self.startup_time) * 1000
+        print(f"[startup] {stage}: {elapsed_ms:.0f} ms", file=sys.stderr)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            self.report_startup("time to first paint")
+            # QtCharts is slow to import, so it is loaded only once the window is up
+            QTimer.singleShot(0, self.init_chart)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.collector_thread.quit()
+        if not self.collector_thread.wait(self.SHUTDOWN_WAIT_MS):
+            # The collector is still stuck in a command; let it go rather than
+            # freeze the UI, and hand the QThread to C++ so Python doesn't
+            # destroy it while it is running
+            sip.transferto(self.collector_thread, None)
+        super().closeEvent(event)
+
+    def init_chart(self):
+        from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+
+        self._QLineSeries = QLineSeries
+        self.series = QLineSeries()  # main series for X continuity
+        self.chart = QChart()
+        self.chart.addSeries(self.series)
+        self.chart.setTitle("GPU Utilization (%) Over Time")
+        self.chart.legend().hide()
+
+        self.axisX = QValueAxis()
+        self.axisX.setRange(0, 60)
+        self.axisX.setLabelFormat("%d")
+        self.axisX.setTitleText("Time (s)")
+
+        self.axisY = QValueAxis()
+        self.axisY.setRange(0, 100)
+        self.axisY.setTitleText("Utilization (%)")
+
+        self.chart.addAxis(self.axisX, Qt.AlignmentFlag.AlignBottom)
+        self.chart.addAxis(self.axisY, Qt.AlignmentFlag.AlignLeft)
+        self.series.attachAxis(self.axisX)
+        self.series.attachAxis(self.axisY)
+
+        chart_view = QChartView(self.chart)
+        chart_view.setMinimumHeight(250)
+        chart_view.setStyleSheet("border: 1px solid #6272a4; border-radius: 5px;")
+        self.stats_layout.replaceWidget(self.chart_placeholder, chart_view)
+        self.chart_placeholder.deleteLater()
+        self.chart_placeholder = None
 
     # --- GPU Switch ---
-    def update_switch_options(self):
-        gpus = get_available_gpus()
+    def update_switch_options(self, gpus):
         self.nvidia_radio.setVisible(False)
         self.intel_radio.setVisible(False)
         if len(gpus) == 2:
@@ -169,18 +239,10 @@ class MainWindow(QMainWindow):
             self.intel_radio.setText(gpus[0])
             self.intel_radio.setVisible(True)
 
-    def update_current(self):
-        self.update_switch_options()
-        current_mode = get_current_gpu()
-        if current_mode == "nvidia" and is_nvidia_loaded():
-            stats = parse_nvidia_smi()
-            gpu_name = stats.get("Name", "NVIDIA GPU")
-        elif current_mode == "nvidia":
-            gpu_name = "NVIDIA GPU"
-        else:
-            gpu_name = get_available_gpus()[-1]
-        self.current_label.setText(f'<span style="color:#50fa7b;">Current GPU:</span> {gpu_name}')
-        if current_mode == "nvidia":
+    def update_current(self, current):
+        self.update_switch_options(current["gpus"])
+        self.current_label.setText(f'<span style="color:#50fa7b;">Current GPU:</span> {current["gpu_name"]}')
+        if current["mode"] == "nvidia":
             self.nvidia_radio.setChecked(True)
         else:
             self.intel_radio.setChecked(True)
@@ -197,76 +259,103 @@ class MainWindow(QMainWindow):
             switch_gpu(mode)
             QMessageBox.information(self, "Success", "GPU switched successfully. Reboot required.")
             self.reboot_btn.setVisible(True)
-            self.update_current()
+            self.request_current.emit()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to switch: {str(e)}")
 
     # --- Stats and chart with dynamic colors ---
-    def update_stats(self):
-        if is_nvidia_loaded():
-            stats = parse_nvidia_smi()
-            util_val = 0
-            for key, lbl in self.stats_labels.items():
-                val = stats.get(key, "-")
-                lbl.setText(val)
-
-                # Dynamic coloring
-                if key == "GPU Utilization (%)":
-                    try:
-                        util_val = int(val)
-                        color = "#50fa7b" if util_val < 70 else "#f1fa8c" if util_val < 90 else "#ff5555"
-                        lbl.setStyleSheet(f"color: {color}; font-weight: bold; font-size: 14px; padding: 3px 0 3px 8px;")
-                    except:
-                        lbl.setStyleSheet("color: #50fa7b; font-size: 14px; padding: 3px 0 3px 8px;")
-                elif key == "Memory Used (MB)":
-                    try:
-                        used = int(val)
-                        total = int(stats.get("Memory Total (MB)", 1))
-                        ratio = used / total
-                        color = "#50fa7b" if ratio < 0.7 else "#f1fa8c" if ratio < 0.9 else "#ff5555"
-                        lbl.setStyleSheet(f"color: {color}; font-weight: bold; font-size: 14px; padding: 3px 0 3px 8px;")
-                    except:
-                        lbl.setStyleSheet("color: #50fa7b; font-size: 14px; padding: 3px 0 3px 8px;")
-                elif key == "Temperature (°C)":
-                    try:
-                        temp = int(val)
-                        color = "#50fa7b" if temp < 70 else "#f1fa8c" if temp < 85 else "#ff5555"
-                        lbl.setStyleSheet(f"color: {color}; font-weight: bold; font-size: 14px; padding: 3px 0 3px 8px;")
-                    except:
-                        lbl.setStyleSheet("color: #50fa7b; font-size: 14px; padding: 3px 0 3px 8px;")
-
-            # --- Update chart dynamically with persistent colors ---
-            self.series.append(QPointF(self.time_counter, util_val))
-            chart_color = QColor("#50fa7b") if util_val < 70 else QColor("#f1fa8c") if util_val < 90 else QColor("#ff5555")
-
-            # Only draw new segment for the last point
-            if self.series.count() > 1:
-                last_point = self.series.at(self.series.count() - 2)
-                temp_series = QLineSeries()
-                temp_series.append(last_point)
-                temp_series.append(QPointF(self.time_counter, util_val))
-                pen = QPen(chart_color, 2)
-                temp_series.setPen(pen)
-                self.chart.addSeries(temp_series)
-                temp_series.attachAxis(self.axisX)
-                temp_series.attachAxis(self.axisY)
-                self.chart_series_segments.append(temp_series)
-
-            self.time_counter += 1
-            if self.time_counter > 60:
-                # Remove old points
-                self.series.removePoints(0, self.series.count() - 60)
-                self.axisX.setRange(self.time_counter - 60, self.time_counter)
+    def refresh_stats(self):
+        # Skip the tick if the previous collection hasn't come back yet
+        if self.stats_in_flight:
+            if time.monotonic() - self.stats_requested_at > self.STALE_AFTER:
+                self.queue_stats_changes(self.stats_view.diff(self.stats_view.render_stale()))
+            return
+        self.stats_in_flight = True
+        self.stats_requested_at = time.monotonic()
+        self.request_stats.emit()
+
+    def update_stats(self, stats, power_times):
+        self.stats_in_flight = False
+        self.stats_requested_at = 0.0
+        if stats is not None and stats.get("Status") == "suspended":
+            # dGPU is in runtime suspend; don't wake it just to show 0%
+            rendered = self.stats_view.render_placeholder("Suspended")
+        elif stats is not None:
+            rendered = self.stats_view.render(stats)
+            try:
+                util_val = int(stats.get("GPU Utilization (%)", 0))
+            except ValueError:
+                util_val = 0
+            if self.chart is not None:
+                self.update_chart(util_val)
         else:
-            for lbl in self.stats_labels.values():
-                lbl.setText("N/A")
-                lbl.setStyleSheet("color: #6272a4; font-size: 14px; padding: 3px 0 3px 8px;")
+            rendered = self.stats_view.render_placeholder("N/A")
+
+        self.queue_stats_changes(self.stats_view.diff(rendered))
+        self.update_power_times(power_times)
+
+        if not self.first_data_done:
+            self.first_data_done = True
+            self.report_startup("time to first data")
+
+    def update_power_times(self, times):
+        # Time spent in each dGPU runtime PM state, as sampled so far
+        if not times:
+            return
+        self.power_label.setText(
+            "dGPU power: " + ", ".join(f"{state} {secs:.0f}s" for state, secs in sorted(times.items()))
+        )
+        self.power_label.setVisible(True)
+
+    def queue_stats_changes(self, dirty):
+        if not dirty:
+            return
+        if not self.pending_stats:
+            QTimer.singleShot(0, self.flush_stats_changes)
+        for field, (text, style) in dirty.items():
+            old_text, old_style = self.pending_stats.get(field, (None, None))
+            self.pending_stats[field] = (
+                text if text is not None else old_text,
+                style if style is not None else old_style,
+            )
 
-        self.update_processes()
+    def flush_stats_changes(self):
+        # Runs once per event loop turn; Qt merges the labels' update()
+        # calls into one backing-store paint of just the changed labels
+        pending, self.pending_stats = self.pending_stats, {}
+        for field, (text, style) in pending.items():
+            lbl = self.stats_labels[field]
+            if text is not None:
+                lbl.setText(text)
+            if style is not None:
+                lbl.setStyleSheet(style)
+
+    def update_chart(self, util_val):
+        # --- Update chart dynamically with persistent colors ---
+        self.series.append(QPointF(self.time_counter, util_val))
+        chart_color = QColor(styles.SEVERITY_COLORS[threshold_bucket(util_val, *UTILIZATION_THRESHOLDS)])
+
+        # Only draw new segment for the last point
+        if self.series.count() > 1:
+            last_point = self.series.at(self.series.count() - 2)
+            temp_series = self._QLineSeries()
+            temp_series.append(last_point)
+            temp_series.append(QPointF(self.time_counter, util_val))
+            pen = QPen(chart_color, 2)
+            temp_series.setPen(pen)
+            self.chart.addSeries(temp_series)
+            temp_series.attachAxis(self.axisX)
+            temp_series.attachAxis(self.axisY)
+            self.chart_series_segments.append(temp_series)
+
+        self.time_counter += 1
+        if self.time_counter > 60:
+            # Remove old points
+            self.series.removePoints(0, self.series.count() - 60)
+            self.axisX.setRange(self.time_counter - 60, self.time_counter)
 
     # --- GPU Processes ---
-    def update_processes(self):
-        processes = parse_nvidia_processes()
+    def update_processes(self, processes):
         self.proc_table.setRowCount(len(processes))
         for row, proc in enumerate(processes):
             self.proc_table.setItem(row, 0, QTableWidgetItem(proc["PID"]))
@@ -289,7 +378,8 @@ class MainWindow(QMainWindow):
             try:
                 subprocess.check_call(["pkexec", "kill", "-9", pid])
                 QMessageBox.information(self, "Success", f"Process {pid} killed.")
-                self.update_processes()
+                reset_nvidia_sampling()
+                self.refresh_stats()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to kill {pid}: {str(e)}")
 
@@ -0,0 +1,84 @@
+import subprocess
+import threading
+import time
+
+import pytest
+
+from gpu_settings.command_runner import CommandRunner, KILL_GRACE_TIMEOUT
+
+SLOW_ECHO = ["sh", "-c", "sleep 0.3; echo hi"]
+
+
+def run_in_threads(func, count):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(func())) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_calls_share_one_spawn():
+    runner = CommandRunner()
+    results = run_in_threads(lambda: runner.run(SLOW_ECHO, text=True).stdout, 5)
+
+    assert results == ["hi\n"] * 5
+    assert runner.get_counters() == {"spawns": 1, "cache_hits": 4, "timeouts": 0}
+
+
+def test_result_cached_for_ttl():
+    runner = CommandRunner()
+    runner.run(["echo", "hi"], ttl=10)
+    runner.run(["echo", "hi"], ttl=10)
+    assert runner.get_counters()["spawns"] == 1
+
+    runner.invalidate(["echo", "hi"])
+    runner.run(["echo", "hi"], ttl=10)
+    assert runner.get_counters()["spawns"] == 2
+
+
+def test_no_cache_without_ttl():
+    runner = CommandRunner()
+    runner.run(["echo", "hi"])
+    runner.run(["echo", "hi"])
+    assert runner.get_counters()["spawns"] == 2
+
+
+def test_timeout_kills_process_group():
+    runner = CommandRunner()
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        # The background sleep keeps stdout open unless the group is killed
+        runner.run("sleep 10 & sleep 10; wait", shell=True, timeout=0.2)
+
+    assert time.monotonic() - start < 2
+    assert runner.get_counters()["timeouts"] == 1
+
+
+def test_timeout_returns_when_pipe_held_outside_group():
+    runner = CommandRunner()
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        # setsid moves the sleep out of the killed group; it keeps stdout open
+        runner.run(["sh", "-c", "setsid sleep 4 & sleep 10"], timeout=0.2)
+
+    assert time.monotonic() - start < 0.2 + KILL_GRACE_TIMEOUT + 0.5
+
+
+def test_joined_call_honours_its_own_timeout():
+    runner = CommandRunner()
+    cmd = ["sleep", "1"]
+    owner = threading.Thread(target=runner.run, args=(cmd,))
+    owner.start()
+    time.sleep(0.1)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run(cmd, timeout=0.1)
+    owner.join()
+
+
+def test_check_output_raises_on_failure():
+    runner = CommandRunner()
+    with pytest.raises(subprocess.CalledProcessError):
+        runner.check_output(["false"])
@@ -0,0 +1,63 @@
+import os
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from gpu_settings import dependency_checker
+from gpu_settings.dependency_checker import DependencyChecker
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def checker(app, monkeypatch):
+    def run(cmd, **kwargs):
+        if cmd[0] == "dpkg":
+            raise subprocess.TimeoutExpired(cmd, kwargs.get("timeout"))
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    warnings = []
+    monkeypatch.setattr(dependency_checker.runner, "run", run)
+    monkeypatch.setattr(dependency_checker.QMessageBox, "warning",
+                        lambda parent, title, text: warnings.append(text))
+    monkeypatch.setattr(DependencyChecker, "has_nvidia_gpu", lambda self: True)
+    monkeypatch.setattr(DependencyChecker, "is_nvidia_working", lambda self: False)
+
+    win = DependencyChecker()
+    win.warnings = warnings
+    yield win
+    win.close()
+
+
+def test_dpkg_timeout_is_not_treated_as_missing(checker):
+    ready = []
+    checker.dependencies_ready.connect(lambda: ready.append(True))
+
+    checker.check_dependencies()
+
+    assert checker.missing == []
+    assert checker.unchecked == ["nvidia-prime", "nvidia-utils-535", "nvidia-driver-535"]
+    assert len(checker.warnings) == 1
+    assert ready == [True]
+
+
+def test_installer_reports_dpkg_timeout(app, monkeypatch):
+    def run(cmd, **kwargs):
+        raise subprocess.TimeoutExpired(cmd, kwargs.get("timeout"))
+
+    monkeypatch.setattr(dependency_checker.runner, "run", run)
+    monkeypatch.setattr(dependency_checker.time, "sleep", lambda seconds: None)
+    worker = dependency_checker.InstallerWorker(["nvidia-prime"])
+    errors = []
+    worker.error.connect(errors.append)
+
+    worker.run()
+
+    assert len(errors) == 1
+    assert "timed out" in errors[0]
@@ -0,0 +1,142 @@
+import types
+
+import pytest
+
+from gpu_settings import gpu_utils
+
+
+def make_pci_device(root, name, vendor, pci_class, runtime_status=None):
+    dev = root / name
+    dev.mkdir()
+    (dev / "vendor").write_text(vendor + "\n")
+    (dev / "class").write_text(pci_class + "\n")
+    if runtime_status is not None:
+        (dev / "power").mkdir()
+        (dev / "power" / "runtime_status").write_text(runtime_status + "\n")
+    return dev
+
+
+def set_runtime_status(dev, status):
+    (dev / "power" / "runtime_status").write_text(status + "\n")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces time.monotonic() in gpu_utils with a settable value."""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(gpu_utils, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def nvidia_smi(monkeypatch):
+    """Replaces runner.check_output in gpu_utils; records nvidia-smi calls."""
+    fake = types.SimpleNamespace(calls=[], util="0", processes="")
+
+    def check_output(cmd, **kwargs):
+        fake.calls.append(cmd)
+        if any(arg.startswith("--query-compute-apps") for arg in cmd):
+            return fake.processes.encode()
+        return f"RTX, 8000, 100, {fake.util}, 40, 535".encode()
+
+    monkeypatch.setattr(gpu_utils.runner, "check_output", check_output)
+    return fake
+
+
+@pytest.fixture
+def sysfs(tmp_path, monkeypatch, clock, nvidia_smi):
+    make_pci_device(tmp_path, "0000:00:02.0", "0x8086", "0x030000")
+    monkeypatch.setattr(gpu_utils, "power_state_times", {})
+    monkeypatch.setattr(gpu_utils, "_last_power_sample", None)
+    gpu_utils.reset_nvidia_sampling()
+    old_root = gpu_utils.SYSFS_PCI_DEVICES
+    gpu_utils.set_sysfs_root(str(tmp_path))
+    yield tmp_path
+    gpu_utils.set_sysfs_root(old_root)
+    gpu_utils.reset_nvidia_sampling()
+
+
+def nvidia_device(sysfs, status):
+    return make_pci_device(sysfs, "0000:01:00.0", "0x10de", "0x030200", status)
+
+
+def test_suspended_dgpu_is_not_queried(sysfs, nvidia_smi):
+    nvidia_device(sysfs, "suspended")
+
+    assert gpu_utils.parse_nvidia_smi() == {"Status": "suspended"}
+    assert gpu_utils.parse_nvidia_processes() == []
+    assert nvidia_smi.calls == []
+
+
+def test_suspending_is_reported_as_suspended(sysfs):
+    nvidia_device(sysfs, "suspending")
+    assert gpu_utils.get_dgpu_power_state() == "suspended"
+
+
+def test_active_dgpu_is_queried(sysfs, nvidia_smi):
+    nvidia_device(sysfs, "active")
+
+    stats = gpu_utils.parse_nvidia_smi()
+    assert stats["Name"] == "RTX"
+    assert gpu_utils.parse_nvidia_processes() == []
+    # Stats and processes come from one sample
+    assert len(nvidia_smi.calls) == 2
+    assert all(cmd[0] == "nvidia-smi" for cmd in nvidia_smi.calls)
+
+
+def test_no_nvidia_device(sysfs):
+    assert gpu_utils.find_nvidia_pci_device() is None
+    assert gpu_utils.get_dgpu_power_state() is None
+
+
+def test_busy_dgpu_sampled_every_interval(sysfs, clock, nvidia_smi):
+    nvidia_device(sysfs, "active")
+    nvidia_smi.util = "50"
+
+    for _ in range(3):
+        gpu_utils.parse_nvidia_smi()
+        clock.now += gpu_utils.NVIDIA_SMI_INTERVAL
+
+    assert len(nvidia_smi.calls) == 6
+
+
+def test_idle_dgpu_sampling_backs_off(sysfs, clock, nvidia_smi):
+    nvidia_device(sysfs, "active")
+
+    sample_times = []
+    for _ in range(40):
+        before = len(nvidia_smi.calls)
+        gpu_utils.parse_nvidia_smi()
+        if len(nvidia_smi.calls) > before:
+            sample_times.append(clock.now)
+        clock.now += 1
+
+    gaps = [b - a for a, b in zip(sample_times, sample_times[1:])]
+    assert gaps == [2, 4, 8, 16]
+
+
+def test_busy_reading_resets_backoff(sysfs, clock, nvidia_smi):
+    nvidia_device(sysfs, "active")
+    for _ in range(8):
+        gpu_utils.parse_nvidia_smi()
+        clock.now += 1
+
+    nvidia_smi.util = "50"
+    clock.now += gpu_utils.NVIDIA_SMI_IDLE_MAX_INTERVAL
+    gpu_utils.parse_nvidia_smi()
+    clock.now += gpu_utils.NVIDIA_SMI_INTERVAL
+    before = len(nvidia_smi.calls)
+    gpu_utils.parse_nvidia_smi()
+    assert len(nvidia_smi.calls) == before + 2
+
+
+def test_power_state_times(sysfs, clock):
+    dev = nvidia_device(sysfs, "active")
+    gpu_utils.get_dgpu_power_state()
+    clock.now += 3
+    set_runtime_status(dev, "suspended")
+    gpu_utils.get_dgpu_power_state()
+    clock.now += 10
+
+    assert gpu_utils.get_power_state_times() == {"active": 3, "suspended": 10}
@@ -0,0 +1,158 @@
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt6.QtCore import QObject, QEvent
+from PyQt6.QtWidgets import QApplication
+
+from gpu_settings import collector, styles
+
+SNAPSHOT = {
+    "Name": "RTX",
+    "Driver": "535",
+    "Memory Total (MB)": "8000",
+    "Memory Used (MB)": "100",
+    "GPU Utilization (%)": "5",
+    "Temperature (°C)": "40",
+}
+
+
+class EventCounter(QObject):
+    """Counts polish and paint events per watched widget."""
+
+    def __init__(self):
+        super().__init__()
+        self.counts = {}
+
+    def watch(self, name, widget):
+        self.counts[name] = {"polish": 0, "paint": 0}
+        widget.setProperty("counter_name", name)
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        name = obj.property("counter_name")
+        if name in self.counts:
+            if event.type() in (QEvent.Type.Polish, QEvent.Type.StyleChange):
+                self.counts[name]["polish"] += 1
+            elif event.type() == QEvent.Type.Paint:
+                self.counts[name]["paint"] += 1
+        return False
+
+    def reset(self):
+        for counts in self.counts.values():
+            counts["polish"] = counts["paint"] = 0
+
+
+def process_events(seconds=0.2):
+    app = QApplication.instance()
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents()
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app, monkeypatch):
+    snapshot = dict(SNAPSHOT)
+    monkeypatch.setattr(collector, "is_nvidia_loaded", lambda: True)
+    monkeypatch.setattr(collector, "parse_nvidia_smi", lambda: dict(snapshot))
+    monkeypatch.setattr(collector, "parse_nvidia_processes", lambda: [])
+    monkeypatch.setattr(collector, "get_power_state_times", lambda: {})
+    monkeypatch.setattr(collector, "get_available_gpus", lambda: ["NVIDIA GPU", "Integrated (Intel)"])
+    monkeypatch.setattr(collector, "get_current_gpu", lambda: "nvidia")
+
+    from gpu_settings.window import MainWindow
+    win = MainWindow()
+    win.timer.stop()  # ticks are driven by the test
+    win.show()
+    process_events(0.5)
+    win.snapshot = snapshot
+    yield win
+    win.close()
+
+
+def tick(window):
+    window.collector.collect_stats()
+    process_events()
+
+
+def watch_labels(window):
+    counter = EventCounter()
+    for field, lbl in window.stats_labels.items():
+        counter.watch(field, lbl)
+    return counter
+
+
+def test_steady_load_does_not_repolish_or_repaint(window):
+    tick(window)
+    counter = watch_labels(window)
+
+    for _ in range(5):
+        tick(window)
+
+    for field, counts in counter.counts.items():
+        assert counts == {"polish": 0, "paint": 0}, field
+
+
+def test_text_change_repaints_only_that_label(window):
+    tick(window)
+    counter = watch_labels(window)
+
+    window.snapshot["GPU Utilization (%)"] = "6"
+    tick(window)
+
+    util = counter.counts.pop("GPU Utilization (%)")
+    assert util["polish"] == 0
+    assert util["paint"] >= 1
+    for field, counts in counter.counts.items():
+        assert counts == {"polish": 0, "paint": 0}, field
+
+
+def test_bucket_change_repolishes_only_that_label(window):
+    tick(window)
+    counter = watch_labels(window)
+
+    window.snapshot["Temperature (°C)"] = "90"
+    tick(window)
+
+    temp = counter.counts.pop("Temperature (°C)")
+    assert temp["polish"] >= 1
+    assert window.stats_labels["Temperature (°C)"].styleSheet() == styles.STAT_VALUE_STYLES["crit"]
+    for field, counts in counter.counts.items():
+        assert counts["polish"] == 0, field
+
+
+def test_stuck_collection_mutes_stats(window):
+    tick(window)
+    texts = {field: lbl.text() for field, lbl in window.stats_labels.items()}
+
+    # Simulate a collection that has been running for longer than STALE_AFTER
+    window.stats_in_flight = True
+    window.stats_requested_at = time.monotonic() - window.STALE_AFTER - 1
+    window.refresh_stats()
+    process_events()
+
+    for field, lbl in window.stats_labels.items():
+        assert lbl.text() == texts[field]
+        assert lbl.styleSheet() == styles.STAT_VALUE_STYLES["muted"]
+
+    tick(window)
+    assert window.stats_labels["Name"].styleSheet() == styles.STAT_VALUE_STYLES["default"]
+
+
+def test_close_does_not_wait_for_stuck_collector(window, monkeypatch):
+    monkeypatch.setattr(collector, "parse_nvidia_smi", lambda: time.sleep(1) or dict(SNAPSHOT))
+    window.SHUTDOWN_WAIT_MS = 100
+    window.refresh_stats()
+    process_events(0.1)
+
+    start = time.monotonic()
+    window.close()
+    assert time.monotonic() - start < 0.5
+    window.collector_thread.wait()
@@ -0,0 +1,64 @@
+from gpu_settings import styles
+from gpu_settings.stats_view import StatsViewModel
+
+SNAPSHOT = {
+    "Name": "RTX",
+    "Driver": "535",
+    "Memory Total (MB)": "8000",
+    "Memory Used (MB)": "100",
+    "GPU Utilization (%)": "5",
+    "Temperature (°C)": "40",
+}
+
+
+def test_first_render_reports_changed_fields():
+    vm = StatsViewModel()
+    dirty = vm.diff(vm.render(SNAPSHOT))
+
+    # Plain fields keep the default style the labels were created with
+    assert dirty["Name"] == ("RTX", None)
+    assert dirty["GPU Utilization (%)"] == ("5", styles.STAT_VALUE_STYLES["ok"])
+    assert set(dirty) == set(SNAPSHOT)
+
+
+def test_unchanged_snapshot_is_clean():
+    vm = StatsViewModel()
+    vm.diff(vm.render(SNAPSHOT))
+    assert vm.diff(vm.render(dict(SNAPSHOT))) == {}
+
+
+def test_text_change_within_bucket_keeps_style():
+    vm = StatsViewModel()
+    vm.diff(vm.render(SNAPSHOT))
+    dirty = vm.diff(vm.render(dict(SNAPSHOT, **{"GPU Utilization (%)": "6"})))
+    assert dirty == {"GPU Utilization (%)": ("6", None)}
+
+
+def test_bucket_change_sets_style():
+    vm = StatsViewModel()
+    vm.diff(vm.render(SNAPSHOT))
+    dirty = vm.diff(vm.render(dict(SNAPSHOT, **{"Temperature (°C)": "90"})))
+    assert dirty == {"Temperature (°C)": ("90", styles.STAT_VALUE_STYLES["crit"])}
+
+
+def test_unparsable_value_uses_unknown_bucket():
+    vm = StatsViewModel()
+    rendered = vm.render(dict(SNAPSHOT, **{"GPU Utilization (%)": "[N/A]"}))
+    assert rendered["GPU Utilization (%)"] == ("[N/A]", "unknown")
+
+
+def test_placeholder_then_data_restores_default_style():
+    vm = StatsViewModel()
+    vm.diff(vm.render_placeholder("N/A"))
+    dirty = vm.diff(vm.render(SNAPSHOT))
+    assert dirty["Name"] == ("RTX", styles.STAT_VALUE_STYLES["default"])
+
+
+def test_stale_keeps_text_and_mutes():
+    vm = StatsViewModel()
+    vm.diff(vm.render(SNAPSHOT))
+    dirty = vm.diff(vm.render_stale())
+
+    assert dirty["Name"] == (None, styles.STAT_VALUE_STYLES["muted"])
+    assert all(text is None for text, _ in dirty.values())
+    assert vm.diff(vm.render_stale()) == {}